@@ -1,8 +1,11 @@
 # app/price_provider.py
-from typing import Optional
+import sys
+import unicodedata
+from types import MappingProxyType
+from typing import Dict, Final, List, Mapping, Optional
 
 # Normalize common names to a canonical key used across sources/local tables
-FERT_ALIAS = {
+_FERT_ALIAS: Final[Dict[str, str]] = {
     "mop": "MOP", "murate of potash": "MOP", "muriate of potash": "MOP", "potassium chloride": "MOP",
     "sop": "SOP", "potassium sulfate": "SOP", "potassium sulphate": "SOP",
     "urea": "Urea", "dap": "DAP", "diammonium phosphate": "DAP",
@@ -14,18 +17,50 @@ FERT_ALIAS = {
     "psb": "PSB", "phosphate solubilizing bacteria": "PSB",
     "rhizobium": "Rhizobium", "azospirillum": "Azospirillum", "azotobacter": "Azotobacter",
 }
+# Intern keys and canonical names so comparisons against them are pointer checks
+FERT_ALIAS: Final[Mapping[str, str]] = MappingProxyType({sys.intern(k): sys.intern(v) for k, v in _FERT_ALIAS.items()})
+
+# Canonical names map to themselves so model output like "Urea"/"DAP" resolves without lowercasing
+_EXACT_ALIAS: Final[Mapping[str, str]] = MappingProxyType({**FERT_ALIAS, **{v: v for v in FERT_ALIAS.values()}})
+
+# Unknown names longer than this are returned as-is rather than interned
+_INTERN_MAX_LEN: Final = 32
 
 def normalize_name(name: Optional[str]) -> Optional[str]:
     """Normalize fertilizer name to canonical form for consistent lookup."""
-    if not name: 
+    if not name:
         return None
-    key = name.strip().lower()
-    return FERT_ALIAS.get(key, name.strip())
+    s = name.strip()
+    canon = _EXACT_ALIAS.get(s)
+    if canon is not None:
+        return canon
+    # ASCII names (the common case) can skip Unicode folding entirely
+    key = s.lower() if s.isascii() else unicodedata.normalize("NFKC", s).lower()
+    canon = FERT_ALIAS.get(key)
+    if canon is not None:
+        return canon
+    return sys.intern(s) if len(s) < _INTERN_MAX_LEN else s
+
+def live_prices_batch(names: List[str], region: Optional[str] = None) -> Dict[str, Optional[float]]:
+    """
+    Return latest market prices in ₹/kg for all `names` in one round trip.
+    Replace this stub with your real API/DB/scraper (e.g. a single POST with the name array).
+    
+    Args:
+        names: Fertilizer names (will be normalized; duplicates are fetched once)
+        region: Geographic region for regional pricing
+        
+    Returns:
+        Mapping of canonical name -> price per kg in rupees, or None if unavailable
+    """
+    canon = [c for c in dict.fromkeys(normalize_name(n) for n in names) if c]
+    # TODO: wire to your live data source. For now, return None to trigger fallback.
+    return {c: None for c in canon}
 
 def live_price_provider(name: str, region: Optional[str] = None) -> Optional[float]:
     """
     Return latest market price in ₹/kg for `name`, or None if unavailable.
-    Replace this stub with your real API/DB/scraper.
+    Single-name convenience wrapper over `live_prices_batch`.
     
     Args:
         name: Fertilizer name (will be normalized)
@@ -35,5 +70,6 @@ def live_price_provider(name: str, region: Optional[str] = None) -> Optional[flo
         Price per kg in rupees, or None if unavailable
     """
     canon = normalize_name(name)
-    # TODO: wire to your live data source. For now, return None to trigger fallback.
-    return None
+    if not canon:
+        return None
+    return live_prices_batch([canon], region).get(canon)
@@ -1,11 +1,24 @@
+import asyncio
+import hashlib
 import json
 import os
-from datetime import datetime, date
-from typing import Dict, Any, Callable, Optional, List
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, date, timezone
+from functools import lru_cache
+from typing import Dict, Any, Callable, Literal, Optional, List, Tuple, Union
 
 from dotenv import load_dotenv
 from app.price_provider import live_price_provider, normalize_name
 
+try:
+    import orjson  # type: ignore
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
 # ---------- (0) Helper function for unit conversion ----------
 def mgkg_to_kg_ha(value_mgkg: float, bulk_density_g_cm3: float = 1.3, depth_cm: float = 15) -> float:
     """
@@ -23,14 +36,48 @@ def mgkg_to_kg_ha(value_mgkg: float, bulk_density_g_cm3: float = 1.3, depth_cm:
     """
     return round(float(value_mgkg) * bulk_density_g_cm3 * depth_cm * 0.1, 2)
 
+
+def _utc_now_iso() -> str:
+    """Current UTC time as ISO-8601 with millisecond precision and a trailing 'Z'."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _canonical_json(obj: Any) -> bytes:
+    """Stable JSON bytes for hashing (sorted keys; stdlib so digests don't depend on orjson)."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+AttachMeta = Union[bool, Literal["refs"]]
+# True: full inputs in _meta, "refs": content digest only, False: no _meta
+
+
+def _check_attach_meta(attach_meta: AttachMeta) -> None:
+    """Reject unknown attach_meta values instead of silently echoing full inputs."""
+    if not isinstance(attach_meta, bool) and attach_meta != "refs":
+        raise ValueError(f'attach_meta must be True, False or "refs", got {attach_meta!r}')
+
+
+def _content_digest(*parts: Any) -> str:
+    """Short hex digest that lets clients correlate a report with its inputs."""
+    return hashlib.blake2b(_canonical_json(parts), digest_size=8).hexdigest()
+
 # ---------- (A) OPTIONAL: Gemini only for phrasing; prices/amounts are computed locally ----------
+try:
+    import google.generativeai as _genai  # type: ignore
+    _GENAI_IMPORT_ERROR: Optional[Exception] = None
+except Exception as e:  # pragma: no cover
+    _genai = None
+    _GENAI_IMPORT_ERROR = e
+
+
+@lru_cache(maxsize=1)
 def _get_gemini_client():
-    try:
-        import google.generativeai as genai  # type: ignore
-    except Exception as e:  # pragma: no cover
+    """Configure and return the genai module; done once per process."""
+    if _genai is None:  # pragma: no cover
         raise RuntimeError(
             "google-generativeai package is required. Install dependencies from requirements.txt"
-        ) from e
+        ) from _GENAI_IMPORT_ERROR
+    genai = _genai
 
     load_dotenv(override=False)
     api_key = os.getenv("GEMINI_API_KEY")
@@ -40,6 +87,143 @@ def _get_gemini_client():
     return genai
 
 
+# The model handle is immutable once built, so one instance is shared by all requests.
+_GEMINI_MODEL_NAME = "gemini-1.5-flash"
+_gemini_model = None
+_gemini_model_lock = threading.Lock()
+
+
+def _get_gemini_model():
+    """Return the shared GenerativeModel, building it on first use."""
+    global _gemini_model
+    if _gemini_model is None:
+        with _gemini_model_lock:
+            if _gemini_model is None:
+                genai = _get_gemini_client()
+                _gemini_model = genai.GenerativeModel(_GEMINI_MODEL_NAME)
+    return _gemini_model
+
+
+# Static part of the phrasing prompt; only the two method hints change per call.
+_REWRITE_PROMPT = (
+    "Rewrite in 1–2 short farmer-friendly lines each (no numbers/doses/prices):\n"
+    "Primary: {primary}\n"
+    "Secondary: {secondary}"
+)
+
+def _split_rewrite_lines(txt: str) -> List[str]:
+    """Split Gemini's rewrite reply into non-empty lines without bullets."""
+    return [p.strip("• ").strip() for p in txt.splitlines() if p.strip()]
+
+
+# Order in which reworded lines are used: first line -> primary, second -> secondary.
+_REWRITE_KEYS = ("primary", "secondary")
+
+
+def _stream_rewrite_lines(
+    response: Any, on_partial: Optional[Callable[[str, str], None]] = None
+) -> List[str]:
+    """
+    Collect reworded lines from a streamed Gemini response.
+
+    Each line is handed to `on_partial` as soon as it is complete, and reading stops once
+    every line in _REWRITE_KEYS has arrived so the rest of the generation is not waited on.
+    If the stream fails part way (e.g. `chunk.text` raising on a blocked chunk), the lines
+    already emitted are returned so the report matches what `on_partial` was told.
+    """
+    lines: List[str] = []
+
+    def _take(text: str) -> None:
+        for line in _split_rewrite_lines(text):
+            if len(lines) == len(_REWRITE_KEYS):
+                return
+            if on_partial is not None:
+                on_partial(_REWRITE_KEYS[len(lines)], line[:180])
+            lines.append(line)
+
+    pending = ""
+    try:
+        for chunk in response:
+            pending += chunk.text or ""
+            cut = pending.rfind("\n")
+            if cut != -1:
+                _take(pending[:cut])
+                pending = pending[cut + 1:]
+            if len(lines) == len(_REWRITE_KEYS):
+                return lines
+    except Exception:
+        return lines  # the unterminated tail may be truncated, so it is dropped
+    _take(pending)
+    return lines
+
+
+Rewrite = Tuple[Optional[str], Optional[str]]
+# Reworded (primary, secondary) reasons; either may be None if Gemini didn't supply it
+
+
+class _LRUCache:
+    """Small thread-safe LRU mapping with per-entry expiry, used to remember Gemini rewrites."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self._ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+
+# Rewrites depend only on the two method hints, so identical hints skip Gemini for an hour.
+_REWRITE_CACHE = _LRUCache(maxsize=1024, ttl=3600.0)
+
+
+def _cache_rewrite(hints: Tuple[str, str], rewrite: Rewrite) -> None:
+    """Remember a rewrite only if both hints came back reworded; partial replies are retried."""
+    if all(rewrite):
+        _REWRITE_CACHE.put(hints, rewrite)
+
+
+def _rewrite_from_lines(lines: List[str]) -> Optional[Rewrite]:
+    """First reply line rewords the primary reason, the second the secondary one."""
+    if not lines:
+        return None
+    return lines[0], (lines[1] if len(lines) > 1 else None)
+
+
+def _report_hints(data: Dict[str, Any]) -> Tuple[str, str]:
+    """The (primary, secondary) method hints a report's reasons are reworded from."""
+    return data["primary_fertilizer"]["application_method"], data["secondary_fertilizer"]["application_method"]
+
+
+# Same rewrite for several reports at once. Method hints repeat heavily across reports, so each
+# distinct hint is sent once under a short id and the reply maps ids to their rewording.
+_BATCH_REWRITE_PROMPT = (
+    "Rewrite each hint as one short farmer-friendly line (no numbers/doses/prices).\n"
+    'Reply with only a JSON object mapping each id to its rewrite, like {{"H1": "..."}}.\n\n'
+    "{hints}"
+)
+
+# Larger batches make the reply slower and more likely to come back malformed.
+BATCH_MAX_ITEMS = 8
+
+
 # ---------- (B) Simple NPK registry ----------
 FERTILIZER_NPK: Dict[str, str] = {
     # Primary/Inorganic (examples)
@@ -115,8 +299,8 @@ RATE_TABLE_DEFAULT: Dict[str, float] = {
 def _load_local_rate_table(path: str = "app/rate_table.json") -> Dict[str, float]:
     """Load local fallback prices if available."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = _json_loads(f.read())
             # Expect {"prices":{"Urea":40, ...}} or {"Urea":40,...}
             return data.get("prices", data)
     except Exception:
@@ -126,6 +310,8 @@ def _load_local_rate_table(path: str = "app/rate_table.json") -> Dict[str, float
 # ---------- (C) Price provider plumbing ----------
 PriceProvider = Callable[[str, Optional[str]], Optional[float]]
 # Signature: (fertilizer_name, region) -> price_per_kg or None
+BatchPriceProvider = Callable[[List[str], Optional[str]], Dict[str, Optional[float]]]
+# Signature: ([fertilizer_name, ...], region) -> {canonical_name: price_per_kg or None}
 
 # Default fallback rates if file is missing
 DEFAULT_FALLBACK_RATES = {
@@ -133,21 +319,49 @@ DEFAULT_FALLBACK_RATES = {
     "Vermicompost": 12, "Neem Cake": 25, "Bone Meal": 18, "Compost": 6, "Poultry manure": 8, "Wood Ash": 3
 }
 
-def _load_local_rate_table(path: str = "app/rate_table.json") -> Dict[str, Any]:
+@dataclass(slots=True)
+class RateTable:
+    """Local price book: ₹/kg by canonical name plus the table's currency and region."""
+    prices: Dict[str, Any]
+    currency: str = "₹"
+    region: Optional[str] = None
+
+def _load_local_rate_table(path: str = "app/rate_table.json") -> RateTable:
     """Load local fallback prices and metadata if available."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = _json_loads(f.read())
             prices = data.get("prices") or data
-            return {"prices": prices, "currency": data.get("currency", "₹"), "region": data.get("region")}
+            return RateTable(prices, data.get("currency", "₹"), data.get("region"))
+    except Exception:
+        return RateTable(DEFAULT_FALLBACK_RATES)
+
+def _prefetch_prices(
+    batch_provider: BatchPriceProvider,
+    names: List[str],
+    region: Optional[str],
+    fallback: Optional[PriceProvider],
+) -> PriceProvider:
+    """Fetch every live price a report needs in one call; return a per-name provider over the results."""
+    canon = [c for c in dict.fromkeys(normalize_name(n) for n in names) if c]
+    try:
+        prices = batch_provider(canon, region) or {}
     except Exception:
-        return {"prices": DEFAULT_FALLBACK_RATES, "currency": "₹", "region": None}
+        prices = {}
+
+    def _provider(name: str, region: Optional[str]) -> Optional[float]:
+        p = prices.get(name)
+        if p is None and fallback is not None:
+            return fallback(name, region)
+        return p
+
+    return _provider
 
 def _resolve_price(
     name: Optional[str], 
     region: Optional[str], 
     price_provider: Optional[PriceProvider], 
-    local_table: Dict[str, Any]
+    local_table: RateTable
 ) -> Optional[float]:
     """Resolve price using live provider first, then local table, then defaults."""
     if not name: 
@@ -164,7 +378,7 @@ def _resolve_price(
             pass
     
     # 2) Try local file
-    prices = local_table.get("prices", {})
+    prices = local_table.prices
     if canon in prices:
         try: 
             return float(prices[canon])
@@ -177,6 +391,12 @@ def _resolve_price(
     
     return None
 
+# Fixed tail of cost_estimate.notes; only field size/unit/region vary per report.
+_COST_NOTES_SUFFIX = (
+    ". Prices fetched from live provider when available; fallback to local rate table."
+    " All three categories (Primary, Secondary, Organic) are always included for complete cost analysis."
+)
+
 def _fmt_money(val: Optional[float], currency: str = "₹", show_zero: bool = True) -> str:
     """Format monetary value with currency symbol, always return a string."""
     if val is None:
@@ -260,6 +480,39 @@ def _method_hint(name: str) -> str:
     return "Follow label guidance and local agronomy recommendations."
 
 
+def _smart_reason(fertilizer_name: str, nutrient_status: str, is_primary: bool = True) -> str:
+    """Generate intelligent explanations based on ML predictions."""
+    if not fertilizer_name:
+        return "No fertilizer recommended by the model."
+
+    role = "primary" if is_primary else "secondary"
+    status_info = ""
+
+    # Add nutrient status context
+    if nutrient_status:
+        if nutrient_status.lower() == "low":
+            status_info = f"ML model detected low {nutrient_status.split('_')[0]} levels, "
+        elif nutrient_status.lower() == "high":
+            status_info = f"ML model detected high {nutrient_status.split('_')[0]} levels, "
+        else:
+            status_info = f"ML model detected optimal {nutrient_status.split('_')[0]} levels, "
+
+    base_reason = f"Selected as {role} fertilizer based on soil analysis and crop requirements. "
+
+    # Add fertilizer-specific guidance
+    fert_lower = fertilizer_name.lower()
+    if fert_lower in {"urea", "calcium ammonium nitrate", "ammonium sulphate"}:
+        specific = "Provides essential nitrogen for vegetative growth and protein synthesis."
+    elif fert_lower in {"dap"}:
+        specific = "Supplies both nitrogen and phosphorus for root development and early growth."
+    elif fert_lower in {"mop", "sop", "potassium sulfate"}:
+        specific = "Enhances fruit quality, disease resistance, and water use efficiency."
+    else:
+        specific = "Provides balanced nutrition according to soil test recommendations."
+
+    return status_info + base_reason + specific
+
+
 def _application_timing_text(sowing_date_str: Optional[str]) -> Dict[str, str]:
     primary = "Give main fertilizer before sowing and again in 2–3 small doses as crop grows."
     secondary = "Use during flowering or fruiting stage when the crop needs extra boost."
@@ -285,16 +538,26 @@ def generate_recommendation_report(
     region: Optional[str] = None,
     currency: str = "₹",
     price_provider: Optional[PriceProvider] = None,
+    batch_price_provider: Optional[BatchPriceProvider] = None,
     local_rate_path: str = "app/rate_table.json",
     use_gemini_for_text: bool = False,
+    on_partial: Optional[Callable[[str, str], None]] = None,
+    attach_meta: AttachMeta = True,
 ) -> Dict[str, Any]:
     """
     Build a JSON-ready recommendation shaped exactly for your UI.
 
     - Amounts (kg) are computed deterministically from ML statuses + field size.
     - Prices come from `price_provider(name, region)` (if given), else local rate table.
+      A `batch_price_provider(names, region)` fetches all of a report's prices in one call.
     - Text phrasing can optionally be refined by Gemini (set use_gemini_for_text=True).
+    - `on_partial(key, text)` is called with "primary"/"secondary" as each reworded
+      line streams in, before the full report is returned.
+    - `attach_meta`: True echoes inputs/predictions/confidences under "_meta", "refs"
+      replaces them with a short content digest, False omits "_meta" entirely.
     """
+    _check_attach_meta(attach_meta)
+
     print(f"🔬 Generating LLM report from ML predictions:")
     print(f"   Predictions: {predictions}")
     print(f"   Confidences: {confidences}")
@@ -340,8 +603,12 @@ def generate_recommendation_report(
 
     # ---------- Price book ----------
     local_table = _load_local_rate_table(local_rate_path)
-    currency = currency or local_table.get("currency", "₹")
-    effective_region = region or local_table.get("region")
+    currency = currency or local_table.currency
+    effective_region = region or local_table.region
+    if batch_price_provider is not None:
+        # Everything this report may price, fetched in a single round trip
+        priced_names = [primary_name, secondary_name, *organics] + ([] if organics else ["Compost"])
+        price_provider = _prefetch_prices(batch_price_provider, priced_names, effective_region, price_provider)
 
     # ---------- Amounts ----------
     # Primary is tied most to N_status if it’s an N source; otherwise use matching status
@@ -464,59 +731,41 @@ def generate_recommendation_report(
     pri_conf = confidences.get("Primary_Fertilizer")
     if pri_conf is None and confidences:
         pri_conf = sum(confidences.values()) / max(len(confidences), 1)
-    confidence_percent = round(float(pri_conf) * 100) if pri_conf is not None else None
+    # Confidences are non-negative floats, so +0.5 and truncate rounds half up
+    confidence_percent = None if pri_conf is None else int(pri_conf * 100 + 0.5)
 
     # ---------- Friendly reasons (with ML-aware explanations) ----------
-    def generate_smart_reason(fertilizer_name: str, nutrient_status: str, is_primary: bool = True) -> str:
-        """Generate intelligent explanations based on ML predictions."""
-        if not fertilizer_name:
-            return "No fertilizer recommended by the model."
-        
-        role = "primary" if is_primary else "secondary"
-        status_info = ""
-        
-        # Add nutrient status context
-        if nutrient_status:
-            if nutrient_status.lower() == "low":
-                status_info = f"ML model detected low {nutrient_status.split('_')[0]} levels, "
-            elif nutrient_status.lower() == "high":
-                status_info = f"ML model detected high {nutrient_status.split('_')[0]} levels, "
-            else:
-                status_info = f"ML model detected optimal {nutrient_status.split('_')[0]} levels, "
-        
-        base_reason = f"Selected as {role} fertilizer based on soil analysis and crop requirements. "
-        
-        # Add fertilizer-specific guidance
-        fert_lower = fertilizer_name.lower()
-        if fert_lower in {"urea", "calcium ammonium nitrate", "ammonium sulphate"}:
-            specific = "Provides essential nitrogen for vegetative growth and protein synthesis."
-        elif fert_lower in {"dap"}:
-            specific = "Supplies both nitrogen and phosphorus for root development and early growth."
-        elif fert_lower in {"mop", "sop", "potassium sulfate"}:
-            specific = "Enhances fruit quality, disease resistance, and water use efficiency."
-        else:
-            specific = "Provides balanced nutrition according to soil test recommendations."
-        
-        return status_info + base_reason + specific
+    primary_reason = _smart_reason(primary_name, n_status, True)
+    secondary_reason = _smart_reason(secondary_name, k_status, False)
 
-    primary_reason = generate_smart_reason(primary_name, n_status, True)
-    secondary_reason = generate_smart_reason(secondary_name, k_status, False)
+    # Shared by the report blocks and the Gemini rewrite (and its cache key)
+    method_hints = (
+        _method_hint(primary_name) if primary_name else "—",
+        _method_hint(secondary_name) if secondary_name else "—",
+    )
 
     # Optionally let Gemini polish the one-liners (never prices/amounts).
     if use_gemini_for_text:
         try:
-            genai = _get_gemini_client()
-            model = genai.GenerativeModel("gemini-1.5-flash")
-            txt = model.generate_content(
-                "Rewrite in 1–2 short farmer-friendly lines each (no numbers/doses/prices):\n"
-                f"Primary: {_method_hint(primary_name) if primary_name else ''}\n"
-                f"Secondary: {_method_hint(secondary_name) if secondary_name else ''}"
-            ).text or ""
-            parts = [p.strip("• ").strip() for p in txt.splitlines() if p.strip()]
-            if parts:
-                primary_reason = parts[0][:180]
-                if len(parts) > 1:
-                    secondary_reason = parts[1][:180]
+            rewrite = _REWRITE_CACHE.get(method_hints)
+            if rewrite is None:
+                model = _get_gemini_model()
+                response = model.generate_content(
+                    _REWRITE_PROMPT.format(primary=method_hints[0], secondary=method_hints[1]),
+                    stream=True,
+                )
+                rewrite = _rewrite_from_lines(_stream_rewrite_lines(response, on_partial))
+                if rewrite is not None:
+                    _cache_rewrite(method_hints, rewrite)
+            elif on_partial is not None:
+                for key, line in zip(_REWRITE_KEYS, rewrite):
+                    if line:
+                        on_partial(key, line[:180])
+            if rewrite is not None:
+                if rewrite[0]:
+                    primary_reason = rewrite[0][:180]
+                if rewrite[1]:
+                    secondary_reason = rewrite[1][:180]
         except Exception:
             pass
 
@@ -546,13 +795,13 @@ def generate_recommendation_report(
             "name": primary_name or "—",
             "amount_kg": primary_amount,
             "reason": primary_reason,
-            "application_method": _method_hint(primary_name) if primary_name else "—",
+            "application_method": method_hints[0],
         },
         "secondary_fertilizer": {
             "name": secondary_name or "—",
             "amount_kg": secondary_amount,
             "reason": secondary_reason if secondary_name else "—",
-            "application_method": _method_hint(secondary_name) if secondary_name else "—",
+            "application_method": method_hints[1],
         },
         "organic_alternatives": organics_blocks,
         "application_timing": timing,
@@ -563,8 +812,7 @@ def generate_recommendation_report(
             "total": _fmt_money(total_cost, currency),
             "notes": f"For {field_size} {field_unit}"
                      + (f" in {effective_region}" if effective_region else "")
-                     + ". Prices fetched from live provider when available; fallback to local rate table."
-                     + " All three categories (Primary, Secondary, Organic) are always included for complete cost analysis.",
+                     + _COST_NOTES_SUFFIX,
             "breakdown": {
                 "primary_details": {
                     "fertilizer": primary_name or "Not recommended",
@@ -585,16 +833,20 @@ def generate_recommendation_report(
                 }
             }
         },
-        "_meta": {
-            "generated_at": datetime.utcnow().isoformat() + "Z",
-            "inputs": base_inputs,
-            "predictions": predictions,
-            "confidences": confidences,
-            "region": effective_region,
-            "currency": currency,
-            "price_source": "live->fallback",
-        },
     }
+
+    if attach_meta:
+        meta: Dict[str, Any] = {"generated_at": _utc_now_iso()}
+        if attach_meta == "refs":
+            meta["inputs_digest"] = _content_digest(base_inputs, predictions, confidences)
+        else:
+            meta["inputs"] = base_inputs
+            meta["predictions"] = predictions
+            meta["confidences"] = confidences
+        meta["region"] = effective_region
+        meta["currency"] = currency
+        meta["price_source"] = "live->fallback"
+        data["_meta"] = meta
     
     print(f"🎯 Generated LLM-Enhanced Report:")
     print(f"   Primary: {data['primary_fertilizer']['name']} ({data['primary_fertilizer']['amount_kg']}kg) - {data['cost_estimate']['primary']}")
@@ -604,4 +856,250 @@ def generate_recommendation_report(
     print(f"   Total Cost: {data['cost_estimate']['total']}")
     print(f"   All three categories guaranteed: ✓")
     
-    return data
\ No newline at end of file
+    return data
+
+
+# ---------- (G) Batch generation ----------
+ReportItem = Tuple[Dict[str, Any], Dict[str, Any], Dict[str, float]]
+# Shape: (base_inputs, predictions, confidences), as passed to generate_recommendation_report
+
+
+def _apply_rewritten_reasons(data: Dict[str, Any], primary: Optional[str], secondary: Optional[str]) -> None:
+    """Replace the fertilizer reasons in a report with Gemini's rewording, if any."""
+    if isinstance(primary, str) and primary.strip():
+        data["primary_fertilizer"]["reason"] = primary.strip()[:180]
+    if isinstance(secondary, str) and secondary.strip():
+        data["secondary_fertilizer"]["reason"] = secondary.strip()[:180]
+
+
+def _parse_json_object(txt: str) -> Optional[Dict[str, Any]]:
+    """Pull the outermost JSON object out of a model reply (tolerates code fences/prose)."""
+    start, end = txt.find("{"), txt.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        parsed = _json_loads(txt[start:end + 1])
+    except Exception:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _rewrite_hints_batch(pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Rewrite]:
+    """Reword up to BATCH_MAX_ITEMS hint pairs with a single Gemini call."""
+    ids: Dict[str, str] = {}
+    for pair in pairs:
+        for hint in pair:
+            if hint and hint not in ids:
+                ids[hint] = f"H{len(ids) + 1}"
+    if not ids:
+        return {}
+    try:
+        model = _get_gemini_model()
+        txt = model.generate_content(
+            _BATCH_REWRITE_PROMPT.format(hints="\n".join(f"{i}: {hint}" for hint, i in ids.items()))
+        ).text or ""
+    except Exception:
+        return {}
+
+    reply = _parse_json_object(txt)
+    if reply is None:
+        return {}  # keep the locally generated reasons
+    reworded: Dict[str, Optional[str]] = {}
+    for hint, i in ids.items():
+        text = reply.get(i)
+        # One line per reason, same as the single-report path that shares the cache
+        lines = _split_rewrite_lines(text) if isinstance(text, str) else []
+        reworded[hint] = lines[0] if lines else None
+    rewrites: Dict[Tuple[str, str], Rewrite] = {}
+    for pair in pairs:
+        rewrite = (reworded.get(pair[0]), reworded.get(pair[1]))
+        if any(rewrite):
+            rewrites[pair] = rewrite
+            _cache_rewrite(pair, rewrite)
+    return rewrites
+
+
+def generate_recommendation_reports_batch(
+    items: List[ReportItem],
+    *,
+    region: Optional[str] = None,
+    currency: str = "₹",
+    price_provider: Optional[PriceProvider] = None,
+    batch_price_provider: Optional[BatchPriceProvider] = None,
+    local_rate_path: str = "app/rate_table.json",
+    use_gemini_for_text: bool = False,
+    attach_meta: AttachMeta = True,
+    batch_size: int = BATCH_MAX_ITEMS,
+) -> List[Dict[str, Any]]:
+    """
+    Build one report per (base_inputs, predictions, confidences) item, in order.
+
+    - Amounts and prices are computed exactly as in generate_recommendation_report.
+    - With use_gemini_for_text=True, reasons for up to `batch_size` distinct items are
+      reworded in a single Gemini call instead of one call per report; each distinct
+      method hint is sent (and reworded) only once per call.
+    - `batch_size` must be between 1 and BATCH_MAX_ITEMS; other values raise ValueError.
+    """
+    _check_attach_meta(attach_meta)
+    if not 1 <= batch_size <= BATCH_MAX_ITEMS:
+        raise ValueError(f"batch_size must be between 1 and {BATCH_MAX_ITEMS}, got {batch_size}")
+    reports = [
+        generate_recommendation_report(
+            base_inputs,
+            predictions,
+            confidences,
+            region=region,
+            currency=currency,
+            price_provider=price_provider,
+            batch_price_provider=batch_price_provider,
+            local_rate_path=local_rate_path,
+            use_gemini_for_text=False,
+            attach_meta=attach_meta,
+        )
+        for base_inputs, predictions, confidences in items
+    ]
+
+    if use_gemini_for_text and reports:
+        # Serve repeats from the cache and send each distinct uncached hint pair only once
+        rewrites: Dict[Tuple[str, str], Rewrite] = {}
+        missing: List[Tuple[str, str]] = []
+        for hints in dict.fromkeys(map(_report_hints, reports)):
+            cached = _REWRITE_CACHE.get(hints)
+            if cached is not None:
+                rewrites[hints] = cached
+            else:
+                missing.append(hints)
+
+        for start in range(0, len(missing), batch_size):
+            rewrites.update(_rewrite_hints_batch(missing[start:start + batch_size]))
+
+        for data in reports:
+            rewrite = rewrites.get(_report_hints(data))
+            if rewrite is not None:
+                _apply_rewritten_reasons(data, *rewrite)
+
+    return reports
+
+
+# ---------- (H) Async generation ----------
+class _RateLimiter:
+    """Spaces out request starts so at most `rpm` begin per minute."""
+
+    def __init__(self, rpm: Optional[float]):
+        self._interval = 60.0 / rpm if rpm else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at) + self._interval
+
+
+async def agenerate_recommendation_report(
+    base_inputs: Dict[str, Any],
+    predictions: Dict[str, Any],
+    confidences: Dict[str, float],
+    *,
+    region: Optional[str] = None,
+    currency: str = "₹",
+    price_provider: Optional[PriceProvider] = None,
+    batch_price_provider: Optional[BatchPriceProvider] = None,
+    local_rate_path: str = "app/rate_table.json",
+    use_gemini_for_text: bool = False,
+    attach_meta: AttachMeta = True,
+) -> Dict[str, Any]:
+    """
+    Async variant of generate_recommendation_report.
+
+    The local build (rate-table read, price providers) runs in a worker thread so blocking
+    providers don't stall the event loop; the optional Gemini rewording is awaited natively.
+    """
+    data = await asyncio.to_thread(
+        generate_recommendation_report,
+        base_inputs,
+        predictions,
+        confidences,
+        region=region,
+        currency=currency,
+        price_provider=price_provider,
+        batch_price_provider=batch_price_provider,
+        local_rate_path=local_rate_path,
+        use_gemini_for_text=False,
+        attach_meta=attach_meta,
+    )
+    if use_gemini_for_text:
+        await _arewrite_reasons(data)
+    return data
+
+
+async def _arewrite_reasons(data: Dict[str, Any], limiter: Optional[_RateLimiter] = None) -> None:
+    """Reword a report's reasons; only a cache miss waits on `limiter` and calls Gemini."""
+    try:
+        hints = _report_hints(data)
+        rewrite = _REWRITE_CACHE.get(hints)
+        if rewrite is None:
+            if limiter is not None:
+                await limiter.wait()
+            model = _get_gemini_model()
+            response = await model.generate_content_async(
+                _REWRITE_PROMPT.format(primary=hints[0], secondary=hints[1])
+            )
+            rewrite = _rewrite_from_lines(_split_rewrite_lines(response.text or ""))
+            if rewrite is not None:
+                _cache_rewrite(hints, rewrite)
+        if rewrite is not None:
+            _apply_rewritten_reasons(data, *rewrite)
+    except Exception:
+        pass
+
+
+async def agenerate_many(
+    items: List[ReportItem],
+    *,
+    max_concurrency: int = 10,
+    rpm: Optional[float] = 100,
+    region: Optional[str] = None,
+    currency: str = "₹",
+    price_provider: Optional[PriceProvider] = None,
+    batch_price_provider: Optional[BatchPriceProvider] = None,
+    local_rate_path: str = "app/rate_table.json",
+    use_gemini_for_text: bool = False,
+    attach_meta: AttachMeta = True,
+) -> List[Dict[str, Any]]:
+    """
+    Generate independent reports concurrently, returned in the order of `items`.
+
+    At most `max_concurrency` reports are in flight, and new Gemini calls start no faster
+    than `rpm` per minute (pass rpm=None to disable the rate limit). Rewrites served from
+    the cache are not throttled.
+    """
+    _check_attach_meta(attach_meta)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    limiter = _RateLimiter(rpm)
+
+    async def _one(item: ReportItem) -> Dict[str, Any]:
+        base_inputs, predictions, confidences = item
+        async with semaphore:
+            data = await agenerate_recommendation_report(
+                base_inputs,
+                predictions,
+                confidences,
+                region=region,
+                currency=currency,
+                price_provider=price_provider,
+                batch_price_provider=batch_price_provider,
+                local_rate_path=local_rate_path,
+                use_gemini_for_text=False,
+                attach_meta=attach_meta,
+            )
+            if use_gemini_for_text:
+                # Cache hits skip the limiter; only real Gemini calls are throttled
+                await _arewrite_reasons(data, limiter)
+            return data
+
+    return list(await asyncio.gather(*(_one(item) for item in items)))
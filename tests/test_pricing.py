@@ -3,7 +3,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.price_provider import live_price_provider
+from app.price_provider import live_price_provider, live_prices_batch, normalize_name
 from llm import generate_recommendation_report
 
 def dummy_provider(name, region=None):
@@ -42,5 +42,38 @@ def test_pricing_paths():
     assert data["_meta"]["region"] == "UP, India"
     print("✓ Pricing test passed!")
 
+def test_normalize_name():
+    """Test alias lookup, whitespace handling and Unicode folding."""
+    assert normalize_name("  Muriate of Potash ") == "MOP"
+    assert normalize_name("psb") == "PSB"
+    assert normalize_name("Calcium Ammonium Nitrate") == "Calcium Ammonium Nitrate"
+    assert normalize_name("\uff35\uff52\uff45\uff41") == "Urea"  # full-width "Urea"
+    assert normalize_name(" Mustard cake ") == "Mustard cake"
+    assert normalize_name("") is None
+    assert normalize_name(None) is None
+    print("✓ Normalization test passed!")
+
+def test_batch_price_provider():
+    """Test that a batch provider prices the whole report in one call, matching per-name pricing."""
+    calls = []
+
+    def batch_provider(names, region=None):
+        calls.append(list(names))
+        return {n: dummy_provider(n, region) for n in names}
+
+    base_inputs = {"Field_Size": 2, "Nitrogen": 85, "Phosphorus": 40, "Potassium": 113}
+    preds = {"Primary_Fertilizer": "urea", "Secondary_Fertilizer": "MOP", "Organic_1": "Vermicompost", "N_Status": "low"}
+    conf = {"Primary_Fertilizer": 0.82}
+
+    batched = generate_recommendation_report(base_inputs, preds, conf, batch_price_provider=batch_provider)
+    single = generate_recommendation_report(base_inputs, preds, conf, price_provider=dummy_provider)
+
+    assert calls == [["Urea", "MOP", "Vermicompost"]]
+    assert batched["cost_estimate"] == single["cost_estimate"]
+    assert live_prices_batch(["mop", "MOP", "dap"]) == {"MOP": None, "DAP": None}
+    print("✓ Batch pricing test passed!")
+
 if __name__ == "__main__":
     test_pricing_paths()
+    test_normalize_name()
+    test_batch_price_provider()
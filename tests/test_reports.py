@@ -0,0 +1,229 @@
+# tests/test_reports.py
+import sys
+import os
+import asyncio
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import llm
+from llm import generate_recommendation_report, generate_recommendation_reports_batch
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rewrite_cache(monkeypatch):
+    """Keep Gemini rewrites cached by one test from leaking into the next."""
+    monkeypatch.setattr(llm, "_REWRITE_CACHE", llm._LRUCache(maxsize=16, ttl=3600.0))
+
+
+class _FakeModel:
+    """Stands in for genai.GenerativeModel; records prompts and returns a canned reply."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        if stream:
+            # Hand the reply back in small chunks, like a streamed response
+            return iter(type("Chunk", (), {"text": self.reply[i:i + 7]})() for i in range(0, len(self.reply), 7))
+        return type("Response", (), {"text": self.reply})()
+
+
+def _items(n):
+    base_inputs = {"Field_Size": 1, "Field_Unit": "hectares", "Nitrogen": 85, "Phosphorus": 40, "Potassium": 113}
+    preds = {"Primary_Fertilizer": "Urea", "Secondary_Fertilizer": "MOP", "N_Status": "low", "K_Status": "low"}
+    return [(base_inputs, preds, {"Primary_Fertilizer": 0.8})] * n
+
+
+def test_batch_rewrites_with_one_call_per_chunk(monkeypatch):
+    """Test that reasons for a chunk of reports are reworded by a single Gemini call."""
+    model = _FakeModel('```json\n{"H1": "Split urea doses.\\nKeep soil moist.", "H2": "Band MOP.", "H3": "Basal DAP."}\n```')
+    monkeypatch.setattr(llm, "_get_gemini_model", lambda: model)
+
+    items = _items(3)
+    items[1] = (items[1][0], {**items[1][1], "Primary_Fertilizer": "DAP"}, items[1][2])
+    reports = generate_recommendation_reports_batch(items, use_gemini_for_text=True)
+
+    assert len(model.prompts) == 1
+    assert model.prompts[0].count("Broadcast or band place") == 1  # the shared MOP hint is sent once
+    assert reports[0]["primary_fertilizer"]["reason"] == "Split urea doses."
+    assert reports[1]["primary_fertilizer"]["reason"] == "Basal DAP."
+    assert reports[1]["secondary_fertilizer"]["reason"] == "Band MOP."
+    assert reports[2]["primary_fertilizer"]["reason"] == "Split urea doses."
+
+    # The cached batch rewrite is a single line per reason on the single-report path too
+    seen = []
+    single = generate_recommendation_report(*items[0], use_gemini_for_text=True, on_partial=lambda k, t: seen.append(t))
+    assert len(model.prompts) == 1
+    assert seen == ["Split urea doses.", "Band MOP."]
+    assert single["primary_fertilizer"]["reason"] == "Split urea doses."
+
+
+def test_batch_keeps_local_reasons_on_bad_reply(monkeypatch):
+    """Test that a malformed reply leaves the deterministic reasons untouched."""
+    model = _FakeModel('Sorry, here you go: ["a", "b"]')
+    monkeypatch.setattr(llm, "_get_gemini_model", lambda: model)
+
+    items = _items(3)
+    for i, name in enumerate(("Urea", "DAP", "SOP")):
+        items[i] = (items[i][0], {**items[i][1], "Primary_Fertilizer": name}, items[i][2])
+    reports = generate_recommendation_reports_batch(items, use_gemini_for_text=True, batch_size=2)
+
+    assert len(model.prompts) == 2
+    assert all("Selected as primary fertilizer" in r["primary_fertilizer"]["reason"] for r in reports)
+
+
+def test_batch_size_out_of_range():
+    """Test that batch sizes above BATCH_MAX_ITEMS are rejected rather than silently capped."""
+    for bad in (0, llm.BATCH_MAX_ITEMS + 1):
+        with pytest.raises(ValueError):
+            generate_recommendation_reports_batch(_items(1), batch_size=bad)
+
+
+def test_agenerate_many_preserves_order(monkeypatch):
+    """Test that concurrent generation returns reports in item order with reworded reasons."""
+    class _AsyncModel(_FakeModel):
+        async def generate_content_async(self, prompt, **kwargs):
+            return self.generate_content(prompt)
+
+    model = _AsyncModel("Use urea in splits.\nBand MOP near roots.")
+    monkeypatch.setattr(llm, "_get_gemini_model", lambda: model)
+
+    items = _items(3)
+    items[1] = (items[1][0], {**items[1][1], "Primary_Fertilizer": "DAP"}, items[1][2])
+    reports = asyncio.run(
+        llm.agenerate_many(items, max_concurrency=2, rpm=None, use_gemini_for_text=True)
+    )
+
+    assert len(model.prompts) <= 3
+    assert [r["primary_fertilizer"]["name"] for r in reports] == ["Urea", "DAP", "Urea"]
+    assert reports[2]["secondary_fertilizer"]["reason"] == "Band MOP near roots."
+
+
+def test_streamed_rewrite_reports_partials(monkeypatch):
+    """Test that streamed reworded lines reach on_partial and end up in the report."""
+    model = _FakeModel("• Split urea into small doses.\n• Band MOP near roots.\nExtra line.")
+    monkeypatch.setattr(llm, "_get_gemini_model", lambda: model)
+    seen = []
+
+    base_inputs, preds, conf = _items(1)[0]
+    report = generate_recommendation_report(
+        base_inputs, preds, conf, use_gemini_for_text=True, on_partial=lambda k, t: seen.append((k, t))
+    )
+
+    assert seen == [("primary", "Split urea into small doses."), ("secondary", "Band MOP near roots.")]
+    assert report["primary_fertilizer"]["reason"] == "Split urea into small doses."
+    assert report["secondary_fertilizer"]["reason"] == "Band MOP near roots."
+
+
+def test_attach_meta_modes():
+    """Test that _meta can carry full inputs, a digest reference, or be omitted."""
+    base_inputs, preds, conf = _items(1)[0]
+
+    full = generate_recommendation_report(base_inputs, preds, conf)
+    refs = generate_recommendation_report(base_inputs, preds, conf, attach_meta="refs")
+    refs_again = generate_recommendation_report(dict(base_inputs), dict(preds), dict(conf), attach_meta="refs")
+    bare = generate_recommendation_report(base_inputs, preds, conf, attach_meta=False)
+
+    assert full["_meta"]["inputs"] is base_inputs
+    assert "inputs" not in refs["_meta"] and len(refs["_meta"]["inputs_digest"]) == 16
+    assert refs["_meta"]["inputs_digest"] == refs_again["_meta"]["inputs_digest"]
+    assert refs["_meta"]["price_source"] == "live->fallback"
+    assert "_meta" not in bare
+
+    for bad in ("ref", "none"):
+        with pytest.raises(ValueError):
+            generate_recommendation_report(base_inputs, preds, conf, attach_meta=bad)
+        with pytest.raises(ValueError):
+            generate_recommendation_reports_batch([], attach_meta=bad)
+
+
+def test_repeated_rewrite_served_from_cache(monkeypatch):
+    """Test that identical hints are reworded by Gemini once and then served from the cache."""
+    model = _FakeModel("Split urea doses.\nBand MOP.")
+    monkeypatch.setattr(llm, "_get_gemini_model", lambda: model)
+    base_inputs, preds, conf = _items(1)[0]
+    seen = []
+
+    first = generate_recommendation_report(base_inputs, preds, conf, use_gemini_for_text=True)
+    second = generate_recommendation_report(
+        base_inputs, preds, conf, use_gemini_for_text=True, on_partial=lambda k, t: seen.append(k)
+    )
+
+    assert len(model.prompts) == 1
+    assert seen == ["primary", "secondary"]
+    assert second["primary_fertilizer"]["reason"] == first["primary_fertilizer"]["reason"] == "Split urea doses."
+
+
+def test_stream_error_keeps_emitted_lines(monkeypatch):
+    """Test that a chunk failing mid-stream keeps the lines already sent to on_partial."""
+    class _BlockedChunk:
+        @property
+        def text(self):
+            raise ValueError("finish-only chunk has no text")
+
+    class _FailingStreamModel(_FakeModel):
+        def generate_content(self, prompt, stream=False, **kwargs):
+            self.prompts.append(prompt)
+            return iter([type("Chunk", (), {"text": "Split urea into small doses.\nBand M"})(), _BlockedChunk()])
+
+    model = _FailingStreamModel("")
+    monkeypatch.setattr(llm, "_get_gemini_model", lambda: model)
+    seen = []
+
+    base_inputs, preds, conf = _items(1)[0]
+    report = generate_recommendation_report(
+        base_inputs, preds, conf, use_gemini_for_text=True, on_partial=lambda k, t: seen.append((k, t))
+    )
+
+    assert seen == [("primary", "Split urea into small doses.")]
+    assert report["primary_fertilizer"]["reason"] == "Split urea into small doses."
+    assert "Selected as secondary fertilizer" in report["secondary_fertilizer"]["reason"]
+
+
+def test_agenerate_many_cache_hits_skip_rate_limit(monkeypatch):
+    """Test that cached rewrites are served without waiting on the rate limiter."""
+    class _AsyncModel(_FakeModel):
+        async def generate_content_async(self, prompt, **kwargs):
+            return self.generate_content(prompt)
+
+    model = _AsyncModel("Use urea in splits.\nBand MOP near roots.")
+    monkeypatch.setattr(llm, "_get_gemini_model", lambda: model)
+    items = _items(6)
+    asyncio.run(llm.agenerate_many(items[:1], rpm=None, use_gemini_for_text=True))  # warm the cache
+
+    start = time.monotonic()
+    reports = asyncio.run(llm.agenerate_many(items, rpm=60, use_gemini_for_text=True))
+
+    assert time.monotonic() - start < 0.5  # 6 throttled calls at 60 rpm would take ~5s
+    assert len(model.prompts) == 1
+    assert all(r["primary_fertilizer"]["reason"] == "Use urea in splits." for r in reports)
+
+
+def test_partial_rewrite_is_not_cached(monkeypatch):
+    """Test that a reply missing the secondary line is used but retried on the next report."""
+    model = _FakeModel("Split urea doses.")
+    monkeypatch.setattr(llm, "_get_gemini_model", lambda: model)
+    base_inputs, preds, conf = _items(1)[0]
+
+    first = generate_recommendation_report(base_inputs, preds, conf, use_gemini_for_text=True)
+    generate_recommendation_report(base_inputs, preds, conf, use_gemini_for_text=True)
+
+    assert first["primary_fertilizer"]["reason"] == "Split urea doses."
+    assert len(model.prompts) == 2
+
+
+def test_rewrite_cache_entries_expire(monkeypatch):
+    """Test that cached rewrites are dropped once their TTL has passed."""
+    clock = [100.0]
+    monkeypatch.setattr(llm.time, "monotonic", lambda: clock[0])
+    cache = llm._LRUCache(maxsize=4, ttl=60.0)
+
+    cache.put(("a", "b"), ("x", "y"))
+    clock[0] += 59.0
+    assert cache.get(("a", "b")) == ("x", "y")
+    clock[0] += 2.0
+    assert cache.get(("a", "b")) is None